@@ -1,13 +1,22 @@
+import ctypes
+import functools
 import os
 import shutil
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future
 
-import humanize
-import psutil
+from textual import work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
 from textual.widgets import DataTable, Footer, Header
+from textual.worker import get_current_worker
+
+# psutil and humanize are imported inside the functions that use them, so the
+# app can paint its first frame before they are loaded.
 
 # The 'resource' module is POSIX-specific (Linux, macOS) and not available on Windows.
 # We'll check for its availability and handle it gracefully.
@@ -18,142 +27,241 @@ try:
 except ImportError:
     RESOURCE_AVAILABLE = False
 
+# Values getrlimit() uses for "unlimited".
+UNLIMITED_LIMITS = frozenset(
+    {-1, resource.RLIM_INFINITY} if RESOURCE_AVAILABLE else {-1}
+)
+
+# Platform checks that can't change while the app runs.
+IS_LINUX = sys.platform.startswith("linux")
+IS_WINDOWS = sys.platform == "win32"
+STATVFS_AVAILABLE = hasattr(os, "statvfs")  # Missing on Windows
+
+# Filesystem types that aren't backed by real storage and are never shown.
+# On Linux, psutil.disk_partitions(all=False) already drops every "nodev"
+# type from /proc/filesystems (tmpfs, proc, cgroup, overlay, fuse.*, ...), so
+# this set only matters there for squashfs, and on platforms where psutil
+# doesn't filter.
+PSEUDO_FSTYPES = frozenset(
+    {
+        "squashfs",
+        "tmpfs",
+        "devtmpfs",
+        "proc",
+        "sysfs",
+        "cgroup",
+        "cgroup2",
+        "autofs",
+        "fuse.gvfsd-fuse",
+    }
+)
+
+# Units used by format_bytes(), one per power of 1024.
+BINARY_UNITS = (
+    "Bytes",
+    "KiB",
+    "MiB",
+    "GiB",
+    "TiB",
+    "PiB",
+    "EiB",
+    "ZiB",
+    "YiB",
+    "RiB",
+    "QiB",
+)
+
+# Mountpoints are stat'ed concurrently, each on its own daemon thread, so one
+# slow (e.g. networked) filesystem does not stall the others. A refresh waits
+# at most STAT_TIMEOUT and reports the rest as timed out. A call that hangs in
+# the kernel can't be cancelled: its thread lives on, but it is never started
+# twice for the same mountpoint and does not keep the process from exiting.
+STAT_TIMEOUT = 2.0  # seconds, for all mountpoints together
+
+# Calls still running from an earlier refresh, keyed by (func, item).
+_in_flight: dict[tuple, Future] = {}
+_in_flight_lock = threading.Lock()
 
-def get_os_info() -> list[tuple]:
+# statx(2) constants (Linux >= 4.11), see <linux/stat.h> and <fcntl.h>.
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x0001
+STATX_BUFFER_SIZE = 256  # sizeof(struct statx)
+
+
+def format_bytes(value: int) -> str:
     """
-    Gathers various OS and filesystem configurations.
+    Formats a byte count in powers of 1024, e.g. 8388608 -> "8.0 MiB".
 
-    Returns:
-        A list of tuples, where each tuple contains the configuration name,
-        its value, and a description.
+    Output matches humanize.naturalsize(value, binary=True) for any integer,
+    negative or huge, but the unit is picked from the bit length instead of by
+    repeated division.
     """
-    info = [("", "CPU", "")]
+    magnitude = abs(value)
+    if magnitude == 1:
+        return f"{value} Byte"
+    if magnitude < 1024:
+        return f"{value} Bytes"
+    # Anything past QiB is still shown in QiB, as humanize does.
+    exponent = min((magnitude.bit_length() - 1) // 10, len(BINARY_UNITS) - 1)
+    scaled = value / (1 << exponent * 10)
+    if round(abs(scaled), 1) >= 1024 and exponent + 1 < len(BINARY_UNITS):
+        # Values just under the next unit would otherwise print as "1024.0".
+        exponent += 1
+        scaled /= 1024
+    return f"{scaled:.1f} {BINARY_UNITS[exponent]}"
+
+
+@functools.cache
+def _cpu_info() -> list[tuple]:
+    """CPU core counts. These never change within a session, so they are cached."""
+    import psutil
 
-    # --- Section: CPU Information ---
     physical_cores = psutil.cpu_count(logical=False)
     logical_cores = psutil.cpu_count(logical=True)
-    info.append(
-        ("CPU Physical Cores", str(physical_cores), "Number of physical CPU cores.")
-    )
-    info.append(
+    return [
+        ("", "CPU", ""),  # Section header
+        ("CPU Physical Cores", str(physical_cores), "Number of physical CPU cores."),
         (
             "CPU Logical Processors",
             str(logical_cores),
             "Total number of CPU threads (hyper-threading).",
-        )
-    )
+        ),
+    ]
+
+
+def _read_proc_meminfo() -> tuple[int, int, int]:
+    """
+    Reads total RAM, available RAM and total swap from /proc/meminfo (Linux).
+
+    The file is opened and parsed once, instead of once per psutil call.
+
+    Returns:
+        A tuple of (total, available, swap total), in bytes.
+    """
+    wanted = {"MemTotal", "MemAvailable", "SwapTotal"}
+    fields = {}
+    with open("/proc/meminfo") as meminfo:
+        for line in meminfo:
+            key, _, value = line.partition(":")
+            if key in wanted:
+                fields[key] = int(value.split()[0]) * 1024  # Values are in kB
+    return fields["MemTotal"], fields["MemAvailable"], fields["SwapTotal"]
+
+
+def _read_memory() -> tuple[int, int, int]:
+    """Returns (total, available, swap total) in bytes, preferring /proc/meminfo."""
+    if IS_LINUX:
+        try:
+            return _read_proc_meminfo()
+        except (OSError, KeyError, ValueError):
+            pass  # Fall back to psutil if /proc is not usable
+    import psutil
 
-    # --- Section: Memory Information ---
-    info.append(("", "Memory Information", ""))  # Section header
     virtual_mem = psutil.virtual_memory()
-    info.append(
+    return virtual_mem.total, virtual_mem.available, psutil.swap_memory().total
+
+
+def _memory_info() -> list[tuple]:
+    """Memory usage, re-read on every refresh."""
+    total_ram, available_ram, total_swap = _read_memory()
+    return [
+        ("", "Memory Information", ""),  # Section header
         (
             "Total RAM",
-            humanize.naturalsize(virtual_mem.total, binary=True),
+            format_bytes(total_ram),
             "Total physical memory (RAM).",
-        )
-    )
-    info.append(
+        ),
         (
             "Available RAM",
-            humanize.naturalsize(virtual_mem.available, binary=True),
+            format_bytes(available_ram),
             "Memory available for new processes without swapping.",
-        )
-    )
-    swap_mem = psutil.swap_memory()
-    info.append(
+        ),
         (
             "Total Swap",
-            humanize.naturalsize(swap_mem.total, binary=True),
+            format_bytes(total_swap),
             "Total swap space available on disk.",
-        )
-    )
+        ),
+    ]
 
-    # --- Section: Process Resource Limits (POSIX-specific) ---
-    info.append(("", "Process Resource Limits", ""))  # Section header
-    if RESOURCE_AVAILABLE:
-        # Helper to format resource limits, which can be -1 for "unlimited"
-        def format_limit(value, formatter=None):
-            if value in [-1, resource.RLIM_INFINITY]:
-                return "Unlimited"
-            return formatter(value) if formatter else f"{value:,}"
 
-        # Max Open Files per process
-        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
-        info.append(
-            (
-                "Max Open Files (Soft)",
-                format_limit(soft),
-                "The effective maximum number of open file descriptors per process.",
-            )
-        )
-        info.append(
-            (
-                "Max Open Files (Hard)",
-                format_limit(hard),
-                "The absolute upper bound for the soft limit, set by the root user.",
-            )
-        )
+@functools.cache
+def _resource_limits_info() -> list[tuple]:
+    """Process resource limits (POSIX-specific), cached for the session."""
+    import humanize
 
-        # Stack Size per process
-        soft, hard = resource.getrlimit(resource.RLIMIT_STACK)
-        info.append(
+    header = ("", "Process Resource Limits", "")  # Section header
+    if not RESOURCE_AVAILABLE:
+        return [
+            header,
             (
-                "Stack Size (Soft)",
-                format_limit(soft, lambda v: humanize.naturalsize(v, binary=True)),
-                "The effective maximum process stack size.",
-            )
-        )
-        info.append(
-            (
-                "Stack Size (Hard)",
-                format_limit(hard, lambda v: humanize.naturalsize(v, binary=True)),
-                "The absolute upper bound for the stack size.",
-            )
-        )
+                "Resource Limits",
+                "Not Available",
+                "The 'resource' module is not available on this OS (e.g., Windows).",
+            ),
+        ]
 
-        # Max Processes per user
-        soft, hard = resource.getrlimit(resource.RLIMIT_NPROC)
-        info.append(
-            (
-                "Max Processes (Soft)",
-                format_limit(soft),
-                "The effective maximum number of processes a user can create.",
-            )
-        )
+    # Helper to format resource limits, which can be -1 for "unlimited"
+    def format_limit(value, formatter=None):
+        if value in UNLIMITED_LIMITS:
+            return "Unlimited"
+        return formatter(value) if formatter else f"{value:,}"
 
+    nofile_soft, nofile_hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    stack_soft, stack_hard = resource.getrlimit(resource.RLIMIT_STACK)
+    nproc_soft, _ = resource.getrlimit(resource.RLIMIT_NPROC)
+    as_soft, _ = resource.getrlimit(resource.RLIMIT_AS)
+    cpu_soft, _ = resource.getrlimit(resource.RLIMIT_CPU)
+    return [
+        header,
+        # Max Open Files per process
+        (
+            "Max Open Files (Soft)",
+            format_limit(nofile_soft),
+            "The effective maximum number of open file descriptors per process.",
+        ),
+        (
+            "Max Open Files (Hard)",
+            format_limit(nofile_hard),
+            "The absolute upper bound for the soft limit, set by the root user.",
+        ),
+        # Stack Size per process
+        (
+            "Stack Size (Soft)",
+            format_limit(stack_soft, format_bytes),
+            "The effective maximum process stack size.",
+        ),
+        (
+            "Stack Size (Hard)",
+            format_limit(stack_hard, format_bytes),
+            "The absolute upper bound for the stack size.",
+        ),
+        # Max Processes per user
+        (
+            "Max Processes (Soft)",
+            format_limit(nproc_soft),
+            "The effective maximum number of processes a user can create.",
+        ),
         # Virtual Memory (Address Space) Limit
-        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
-        info.append(
-            (
-                "Virtual Memory (Soft)",
-                format_limit(soft, lambda v: humanize.naturalsize(v, binary=True)),
-                "The effective max virtual memory (address space) a process can use.",
-            )
-        )
-
+        (
+            "Virtual Memory (Soft)",
+            format_limit(as_soft, format_bytes),
+            "The effective max virtual memory (address space) a process can use.",
+        ),
         # CPU Time Limit
-        soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
-        info.append(
-            (
-                "CPU Time (Soft)",
-                format_limit(soft, humanize.naturaldelta),
-                "The max CPU time a process can consume before being sent a signal.",
-            )
-        )
+        (
+            "CPU Time (Soft)",
+            format_limit(cpu_soft, humanize.naturaldelta),
+            "The max CPU time a process can consume before being sent a signal.",
+        ),
+    ]
 
-    else:
-        info.append(
-            (
-                "Resource Limits",
-                "Not Available",
-                "The 'resource' module is not available on this OS (e.g., Windows).",
-            )
-        )
 
-    # --- Section: Filesystem Limits ---
-    info.append(("", "Filesystem Limits", ""))  # Section header
-    path = "/" if sys.platform != "win32" else "C:\\"
+@functools.cache
+def _filesystem_limits_info() -> list[tuple]:
+    """Filename and path limits of the root filesystem, cached for the session."""
+    info = [("", "Filesystem Limits", "")]  # Section header
+    path = "C:\\" if IS_WINDOWS else "/"
     try:
         max_filename = os.pathconf(path, "PC_NAME_MAX")
         info.append(
@@ -190,61 +298,220 @@ def get_os_info() -> list[tuple]:
             )
         )
 
-    # --- Section: Disk and Inode Information ---
-    info.append(("", "Mounted Filesystems", ""))  # Section header
-    processed_devices = set()
-    for part in psutil.disk_partitions():
-        if (
-            "loop" in part.device
-            or "squashfs" in part.fstype
-            or not os.path.exists(part.mountpoint)
-        ):
-            continue
-        if part.device in processed_devices:
-            continue
-        processed_devices.add(part.device)
+    return info
+
+
+def _run_in_flight(key: tuple, future: Future) -> None:
+    """Thread body: runs func(item) for key and resolves the future with it."""
+    func, item = key
+    try:
+        future.set_result(func(item))
+    except Exception as e:  # Re-raised in the caller by future.result()
+        future.set_exception(e)
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+
+
+def _submit(func, item) -> Future:
+    """
+    Starts func(item) on a daemon thread, unless that call is still running.
+
+    A call that is still in flight from an earlier refresh is reused rather
+    than started again, so a hung mount holds at most one thread per call.
+    """
+    key = (func, item)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is None:
+            future = _in_flight[key] = Future()
+            threading.Thread(
+                target=_run_in_flight, args=(key, future), daemon=True
+            ).start()
+    return future
+
+
+def _map_with_deadline(func, items) -> list:
+    """
+    Calls func on each item concurrently and returns the results in order.
 
+    Calls still running after STAT_TIMEOUT yield None. They are left running
+    on their daemon threads, and the next call with the same item waits on
+    them instead of starting another one.
+    """
+    futures = [_submit(func, item) for item in items]
+    deadline = time.monotonic() + STAT_TIMEOUT
+    results = []
+    for future in futures:
         try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except TimeoutError:
+            results.append(None)
+    return results
+
+
+@functools.cache
+def _libc_statx():
+    """
+    Returns libc's statx() function, or None if it can't be used.
+
+    The probe runs once: it needs Linux, a libc exporting statx (glibc 2.28+)
+    and a kernel that lets it stat "/".
+    """
+    if not IS_LINUX:
+        return None
+    try:
+        statx = ctypes.CDLL(None).statx
+    except (OSError, AttributeError):
+        return None
+    statx.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_uint,
+        ctypes.c_void_p,
+    ]
+    statx.restype = ctypes.c_int
+    buf = ctypes.create_string_buffer(STATX_BUFFER_SIZE)
+    if statx(AT_FDCWD, b"/", AT_STATX_DONT_SYNC, STATX_TYPE, buf) != 0:
+        return None  # e.g. ENOSYS on older kernels, or blocked by seccomp
+    return statx
+
+
+def _path_exists(path: str) -> bool:
+    """
+    Checks that a path exists without forcing a filesystem sync.
+
+    On Linux this uses statx() with AT_STATX_DONT_SYNC, which lets networked
+    filesystems answer from cached attributes; elsewhere it is os.path.exists().
+    """
+    statx = _libc_statx()
+    if statx is None:
+        return os.path.exists(path)
+    buf = ctypes.create_string_buffer(STATX_BUFFER_SIZE)
+    return statx(AT_FDCWD, os.fsencode(path), AT_STATX_DONT_SYNC, STATX_TYPE, buf) == 0
+
+
+@functools.cache
+def _disk_partitions() -> tuple:
+    """
+    Enumerates the mounted partitions worth displaying, once per session.
+
+    Loop devices, pseudo filesystems, missing mountpoints and repeated devices
+    are skipped. The device and type checks run first so that only the
+    remaining mountpoints are probed. Mountpoints that don't answer the probe
+    in time are kept, so they show up as timed out instead of vanishing.
+    """
+    import psutil
+
+    candidates = [
+        part
+        for part in psutil.disk_partitions(all=False)
+        if part.fstype not in PSEUDO_FSTYPES and "loop" not in part.device
+    ]
+    # Probe every mountpoint at once rather than one after another.
+    exists = _map_with_deadline(_path_exists, [p.mountpoint for p in candidates])
+    unique_parts = {}
+    for part, present in zip(candidates, exists):
+        if present is not False:
+            # Keep the first mountpoint of each device, in mount order.
+            unique_parts.setdefault(part.device, part)
+    return tuple(unique_parts.values())
+
+
+def _stat_partition(part) -> list[tuple]:
+    """Disk and inode usage rows for a single partition."""
+    import humanize
+
+    info = []
+    stats = None
+    try:
+        if STATVFS_AVAILABLE:
+            # A single statvfs call yields both byte and inode counts;
+            # shutil.disk_usage() would issue a second one on POSIX.
+            stats = os.statvfs(part.mountpoint)
+            total = stats.f_blocks * stats.f_frsize
+            free = stats.f_bavail * stats.f_frsize
+        else:
             usage = shutil.disk_usage(part.mountpoint)
+            total, free = usage.total, usage.free
+    except OSError as e:
+        info.append(
+            (
+                f"Disk: {part.mountpoint}",
+                f"Error: {e.strerror}",
+                f"Device: {part.device}",
+            )
+        )
+        if STATVFS_AVAILABLE:
             info.append(
                 (
-                    f"Disk: {part.mountpoint}",
-                    f"{humanize.naturalsize(usage.total)} Total, {humanize.naturalsize(usage.free)} Free",
-                    f"Device: {part.device}",
+                    f"Inodes: {part.mountpoint}",
+                    f"Error: {e.strerror}",
+                    f"Filesystem type: {part.fstype}",
                 )
             )
-        except OSError as e:
-            info.append(
+        return info
+
+    info.append(
+        (
+            f"Disk: {part.mountpoint}",
+            f"{humanize.naturalsize(total)} Total, {humanize.naturalsize(free)} Free",
+            f"Device: {part.device}",
+        )
+    )
+    if stats is not None and stats.f_files > 0:
+        info.append(
+            (
+                f"Inodes: {part.mountpoint}",
+                f"{humanize.intcomma(stats.f_files)} Total, {humanize.intcomma(stats.f_ffree)} Free",
+                f"Filesystem type: {part.fstype}",
+            )
+        )
+    return info
+
+
+def _mounted_filesystems_info() -> list[tuple]:
+    """Disk and inode usage of the cached partitions, re-read on every refresh."""
+    info = [("", "Mounted Filesystems", "")]  # Section header
+    partitions = _disk_partitions()
+    for part, rows in zip(partitions, _map_with_deadline(_stat_partition, partitions)):
+        if rows is None:
+            rows = [
                 (
                     f"Disk: {part.mountpoint}",
-                    f"Error: {e.strerror}",
+                    "Error: Timed out",
                     f"Device: {part.device}",
                 )
-            )
+            ]
+        info.extend(rows)
+    return info
 
-        if hasattr(os, "statvfs"):
-            try:
-                stats = os.statvfs(part.mountpoint)
-                total_inodes = stats.f_files
-                free_inodes = stats.f_ffree
-                if total_inodes > 0:
-                    info.append(
-                        (
-                            f"Inodes: {part.mountpoint}",
-                            f"{humanize.intcomma(total_inodes)} Total, {humanize.intcomma(free_inodes)} Free",
-                            f"Filesystem type: {part.fstype}",
-                        )
-                    )
-            except OSError as e:
-                info.append(
-                    (
-                        f"Inodes: {part.mountpoint}",
-                        f"Error: {e.strerror}",
-                        f"Filesystem type: {part.fstype}",
-                    )
-                )
 
-    return info
+def clear_static_cache() -> None:
+    """Forgets the cached static sections so the next call re-queries them."""
+    _cpu_info.cache_clear()
+    _resource_limits_info.cache_clear()
+    _filesystem_limits_info.cache_clear()
+    _disk_partitions.cache_clear()
+
+
+def iter_os_info() -> Iterator[tuple]:
+    """
+    Gathers various OS and filesystem configurations.
+
+    Static sections (CPU, resource limits, filesystem limits and the partition
+    list) are cached after the first call; memory and disk usage are re-read
+    every time. Call clear_static_cache() to force a full re-query.
+
+    Yields:
+        Tuples containing the configuration name, its value, and a description.
+    """
+    yield from _cpu_info()
+    yield from _memory_info()
+    yield from _resource_limits_info()
+    yield from _filesystem_limits_info()
+    yield from _mounted_filesystems_info()
 
 
 class LimitsApp(App):
@@ -256,6 +523,7 @@ class LimitsApp(App):
     BINDINGS = [
         Binding("q", "quit", "Quit"),
         Binding("r", "refresh", "Refresh"),
+        Binding("R", "reload", "Reload"),
     ]
 
     def compose(self) -> ComposeResult:
@@ -267,14 +535,32 @@ class LimitsApp(App):
 
     def on_mount(self) -> None:
         """Called when the app is mounted to populate the table."""
-        self.populate_table()
+        # Let the header and footer paint before the first data pass.
+        self.call_after_refresh(self.populate_table)
 
     def action_refresh(self) -> None:
         """Called when the user presses the 'r' key to refresh data."""
         self.populate_table()
 
+    def action_reload(self) -> None:
+        """Called when the user presses 'R' to re-query the cached static data."""
+        clear_static_cache()
+        self.populate_table()
+
     def populate_table(self) -> None:
-        """Gathers data and populates the DataTable widget."""
+        """Shows a loading indicator and gathers the data in a worker thread."""
+        self.query_one(DataTable).loading = True
+        self.gather_rows()
+
+    @work(thread=True, exclusive=True)
+    def gather_rows(self) -> None:
+        """Collects the OS info off the UI thread, so slow mounts can't freeze it."""
+        rows = list(iter_os_info())
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self.show_rows, rows)
+
+    def show_rows(self, rows: list[tuple]) -> None:
+        """Populates the DataTable widget with the gathered rows."""
         table = self.query_one(DataTable)
         table.clear()  # Clear previous data on refresh
         if not table.columns:
@@ -282,17 +568,11 @@ class LimitsApp(App):
             table.cursor_type = "row"
             table.zebra_stripes = True
 
-        os_info = get_os_info()
-        for item in os_info:
-            if item[1] in (
-                "CPU",
-                "Memory Information",  # <-- Add new section header
-                "Process Resource Limits",
-                "Filesystem Limits",
-                "Mounted Filesystems",
-            ):
+        for item in rows:
+            if not item[0]:  # Section headers have no name; space them out
                 table.add_row()
             table.add_row(*item, label=item[0])
+        table.loading = False
 
 
 if __name__ == "__main__":